@@ -5,7 +5,7 @@ from contextlib import AsyncExitStack
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
 from dotenv import load_dotenv
 from rich.console import Console
 from rich.prompt import Prompt
@@ -14,16 +14,24 @@ from rich.prompt import Prompt
 load_dotenv()  # load environment variables from .env
 console = Console()
 
+SYSTEM_PROMPT = "Inform users of all available operations based on the provided tools after they enter their username. If a user tries to specify a different username, notify them that changing the username is not allowed."
+
+# The initial call mostly just picks a tool, so a small fast model with a
+# short output budget is enough; the full model only writes the final answer
+ROUTER_MODEL = "claude-3-5-haiku-latest"
+ANSWER_MODEL = "claude-3-5-sonnet-20241022"
+
 class MCPClient:
     
   def __init__(self):
     # Initialize session and client objects
     self.session: Optional[ClientSession] = None
     self.exit_stack = AsyncExitStack()
-    self.anthropic = Anthropic()
+    self.anthropic = AsyncAnthropic()
     self.username = None
     self.role = None
     self.messages = []
+    self._available_tools = []
     
   
   async def connect_to_server(self, server_script_path: str):
@@ -49,13 +57,27 @@ class MCPClient:
     self.session = await self.exit_stack.enter_async_context(ClientSession(self.stdio, self.write))
 
     await self.session.initialize()
-    
-    # List available tools
+
+    # List available tools once; the server's tool set is static for the session
     response = await self.session.list_tools()
-    tools = response.tools
-    console.print("\nConnected to server with tools:", [tool.name for tool in tools])
+    self._available_tools = [
+      {
+          "name": tool.name,
+          "description": tool.description,
+          "input_schema": tool.inputSchema
+      }
+      for tool in response.tools
+    ]
+    console.print("\nConnected to server with tools:", [tool["name"] for tool in self._available_tools])
     
         
+  def _log_cache_usage(self, response):
+    """Log prompt cache hits vs writes to verify caching is working"""
+    usage = response.usage
+    cache_read = getattr(usage, 'cache_read_input_tokens', None) or 0
+    cache_creation = getattr(usage, 'cache_creation_input_tokens', None) or 0
+    console.print(f"[dim]cache read: {cache_read} tokens, cache write: {cache_creation} tokens[/dim]")
+
   async def process_query(self, query: str) -> str:
     """Process a query using Claude and available tools"""
     self.messages = [
@@ -66,18 +88,11 @@ class MCPClient:
       }
     ]
 
-    response = await self.session.list_tools()
-    available_tools = []
     reserved_tools = ['list_pending_restaurant_request', 'list_pending_dish_request', 'approve_restaurant_access', 'approve_opeartion_request' ]
-    
+
     available_tools = [
-      {
-          "name": tool.name,
-          "description": tool.description,
-          "input_schema": tool.inputSchema
-      }
-      for tool in response.tools
-      if tool.name != 'verify_access'
+      tool for tool in self._available_tools
+      if tool["name"] != 'verify_access'
     ]
 
     if self.role != 'parent':
@@ -85,66 +100,83 @@ class MCPClient:
             tool for tool in available_tools
             if tool["name"] not in reserved_tools
     ]
-        
+
+    if available_tools:
+      # Cache the prefix up to the last tool definition so repeat calls
+      # read the tool schemas from cache instead of re-processing them
+      available_tools[-1] = {**available_tools[-1], "cache_control": {"type": "ephemeral"}}
+
     # Initial Claude API call
-    response = self.anthropic.messages.create(
-      model="claude-3-5-sonnet-20241022",
-      max_tokens=1000,
-      system="Inform users of all available operations based on the provided tools after they enter their username. If a user tries to specify a different username, notify them that changing the username is not allowed.",
+    response = await self.anthropic.messages.create(
+      model=ROUTER_MODEL,
+      max_tokens=256,
+      system=[{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}],
       messages=self.messages,
       tools=available_tools
     )
+    self._log_cache_usage(response)
     self.messages.append({
       "role": "assistant",
       "content": response.content
     })
-        
-    first_llm_content = [*response.content]
+
     # Process response and handle tool calls
     final_text = []
-    for content in first_llm_content:
-      if content.type == 'text':
-        final_text.append(content.text)
-      elif content.type == 'tool_use':
-        tool_name = content.name
-        tool_args = content.input
-
-        # Execute tool call
-        result = await self.session.call_tool(tool_name, tool_args)
-        
-        final_text.append(f"\n[Calling tool {tool_name} with args {tool_args}]\n")
-        self.messages.append({
-            "role": "user",
-            "content": [
-                {
-                  "type": "tool_result",
-                  "tool_use_id": content.id,
-                  "content": result.content
-                }
-            ]
-        })
-        
-        # Get next response from Claude
-        response = self.anthropic.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=1000,
-            messages=self.messages,
-            tools=available_tools
-        )
-        
-        tool_use_content = [
-            content for content in response.content
-            if content.type == 'tool_use'
-        ]
-        if len(tool_use_content): 
-          first_llm_content.append(tool_use_content[0])
-
-        self.messages.append({
-          "role": "assistant",
-          "content": response.content
+    while True:
+      tool_uses = []
+      for content in response.content:
+        if content.type == 'text':
+          final_text.append(content.text)
+        elif content.type == 'tool_use':
+          tool_uses.append(content)
+
+      if not tool_uses:
+        break
+
+      # Execute all tool calls from this response concurrently
+      results = await asyncio.gather(*[
+        self.session.call_tool(content.name, content.input)
+        for content in tool_uses
+      ])
+
+      tool_results = []
+      for content, result in zip(tool_uses, results):
+        final_text.append(f"\n[Calling tool {content.name} with args {content.input}]\n")
+        tool_results.append({
+          "type": "tool_result",
+          "tool_use_id": content.id,
+          "content": result.content
         })
-        final_text.append(response.content[0].text)
-        
+
+      # Cache breakpoint on the latest user turn so the follow-up call
+      # reads the whole conversation prefix from cache. Drop markers from
+      # earlier turns to stay within Anthropic's four-breakpoint limit.
+      for message in self.messages:
+        if message["role"] == "user" and isinstance(message["content"], list):
+          for block in message["content"]:
+            if isinstance(block, dict):
+              block.pop("cache_control", None)
+      tool_results[-1]["cache_control"] = {"type": "ephemeral"}
+      self.messages.append({
+        "role": "user",
+        "content": tool_results
+      })
+
+      # Get next response from Claude
+      response = await self.anthropic.messages.create(
+          model=ANSWER_MODEL,
+          max_tokens=1000,
+          system=[{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}],
+          messages=self.messages,
+          tools=available_tools
+      )
+      self._log_cache_usage(response)
+
+      self.messages.append({
+        "role": "assistant",
+        "content": response.content
+      })
+
     return "\n".join(final_text)
   
   async def chat_loop(self):